@@ -17,7 +17,15 @@ import datetime
 import yaml
 import operator
 import re
+import sys
+import json
+import hashlib
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import open
+from urllib.parse import urlparse, unquote
 
 logger = logging.getLogger(__name__)
 __version__ = '0.1.0'
@@ -70,6 +78,7 @@ brepository_default_settings = {
                         {% if url %}
                         </a>
                         {% endif %}
+                        {% if link_status == 'dead' %}<span class="label label-danger">Broken link</span>{% endif %}
                         </div>
                         <div class="col-md-12">
                             {% if version or package_type%}
@@ -105,6 +114,7 @@ brepository_default_settings = {
                     {% if title %}
                         <h4 class="list-group-item-heading {{item_css}}">{{title}} <i class="fa fa-download"></i></h4>
                     {% endif %}
+                    {% if link_status == 'dead' %}<span class="label label-danger">Broken link</span>{% endif %}
                     {% if size %}
                         <span class="text-muted">({{size}})</span>
                         <br>
@@ -148,6 +158,7 @@ brepository_default_settings = {
                 {% if url %}
                 </a>
                 {% endif %}
+                {% if link_status == 'dead' %}<span class="label label-danger">Broken link</span>{% endif %}
                 {% if size %}
                 <span class="text-muted">({{size}})</span>
                 {% endif %}
@@ -171,6 +182,10 @@ brepository_default_settings = {
                 password "{{password}}"
                 </strong>
                 {% endif %}
+                {% if sha256 %}
+                <br>
+                <small class="text-muted">SHA-256 <code>{{sha256}}</code></small>
+                {% endif %}
             </div>
         </div>
     """,
@@ -288,11 +303,246 @@ brepository_default_settings = {
     'template-variable': False,
     'item': None,
     'site-url': '',
-    'debug_processing': False
+    'debug_processing': False,
+    'file-info': True,
+    'file-info-cache': None,
+    'file-info-workers': 4,
+    'link-check': False,
+    'link-check-cache': None,
+    'link-check-report': None,
+    'link-check-concurrency': 20,
+    'link-check-per-host': 4,
+    'link-check-timeout': 10,
+    'link-check-ttl': 86400,
+    'link-check-error-ttl': 600,
+    'memory-budget': 64,
+    'content-path': None,
+    'output-path': None
 }
 
 brepository_settings = copy.deepcopy(brepository_default_settings)
 
+# Pristine default settings, used to reset settings when Pelican is re-initialized
+brepository_base_settings = copy.deepcopy(brepository_default_settings)
+
+# In-process LRU cache for registries, compiled templates and rendered fragments, (kind, key) -> {'value', 'size'}
+brepository_cache = OrderedDict()
+brepository_cache_stats = {'size': 0, 'peak': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+# Persistent file information store, absolute path -> {'mtime', 'size', 'sha256'}
+brepository_file_info = {}
+
+# Persistent link check store, url -> {'checked', 'status', 'error', 'failures'}
+brepository_link_status = {}
+
+# Registry sources used during the current build, their links are checked and reported
+brepository_link_sources = set()
+brepository_link_check_started = False
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Compiled jinja2 template takes roughly 15-30 times the memory of its source
+TEMPLATE_SIZE_FACTOR = 20
+
+
+def approximate_size(data, seen=None):
+    """
+    Approximate memory usage of the data structure in bytes
+
+    :param data: data
+    :param seen: set of object ids already counted
+    :return: size in bytes
+    """
+
+    if seen is None:
+        seen = set()
+
+    if id(data) in seen:
+        return 0
+    seen.add(id(data))
+
+    size = sys.getsizeof(data)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            size += approximate_size(key, seen) + approximate_size(value, seen)
+
+    elif isinstance(data, (list, tuple, set)):
+        for value in data:
+            size += approximate_size(value, seen)
+
+    return size
+
+
+def cache_get(kind, key):
+    """
+    Get value from the in-process cache
+
+    :param kind: cache entry kind, registry, template or fragment
+    :param key: cache key
+    :return: value or None
+    """
+
+    entry = brepository_cache.get((kind, key))
+    if entry is None:
+        brepository_cache_stats['misses'] += 1
+        return None
+
+    brepository_cache.move_to_end((kind, key))
+    brepository_cache_stats['hits'] += 1
+    return entry['value']
+
+
+def cache_set(kind, key, value, size=None):
+    """
+    Store value into the in-process cache. Least recently used entries are evicted
+    when the total approximate size exceeds the memory budget.
+
+    :param kind: cache entry kind, registry, template or fragment
+    :param key: cache key
+    :param value: value
+    :param size: approximate size in bytes, if None size is approximated from the value
+    :return: value
+    """
+
+    budget = brepository_default_settings['memory-budget'] * 1024 * 1024
+    if size is None:
+        size = approximate_size(value)
+    size += approximate_size(key)
+
+    if (kind, key) in brepository_cache:
+        brepository_cache_stats['size'] -= brepository_cache.pop((kind, key))['size']
+
+    if size > budget:
+        return value
+
+    brepository_cache[(kind, key)] = {'value': value, 'size': size}
+    brepository_cache_stats['size'] += size
+
+    while brepository_cache_stats['size'] > budget:
+        brepository_cache_stats['size'] -= brepository_cache.popitem(last=False)[1]['size']
+        brepository_cache_stats['evictions'] += 1
+
+    brepository_cache_stats['peak'] = max(brepository_cache_stats['peak'], brepository_cache_stats['size'])
+
+    return value
+
+
+def cache_refresh(kind, key):
+    """
+    Recalculate size of the cache entry after its value has been modified
+
+    :param kind: cache entry kind, registry, template or fragment
+    :param key: cache key
+    :return: nothing
+    """
+
+    entry = brepository_cache.get((kind, key))
+    if entry is not None:
+        cache_set(kind, key, entry['value'])
+
+
+def reset_build_state():
+    """
+    Reset per-build state, cache entries are kept for the next build
+
+    """
+
+    global brepository_link_check_started
+
+    brepository_cache_stats['hits'] = 0
+    brepository_cache_stats['misses'] = 0
+    brepository_cache_stats['evictions'] = 0
+    brepository_cache_stats['peak'] = brepository_cache_stats['size']
+
+    brepository_link_sources.clear()
+    brepository_link_check_started = False
+
+
+def clear_caches():
+    """
+    Clear all in-process state of the plugin
+
+    """
+
+    brepository_cache.clear()
+    brepository_cache_stats['size'] = 0
+    reset_build_state()
+
+
+def peak_rss():
+    """
+    Peak resident set size of the process
+
+    :return: size in bytes or None if not available
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return rss
+
+    return rss * 1024
+
+
+def report_memory(pelican):
+    """
+    Report peak memory usage and cache size
+
+    """
+
+    rss = peak_rss()
+    logger.info('`pelican-brepository` peak RSS [{rss}] cache [{size} / {budget}] peak cache [{peak}] entries [{entries}] hits [{hits}] misses [{misses}] evictions [{evictions}]'.format(
+        rss=format_size(rss) if rss is not None else 'n/a',
+        size=format_size(brepository_cache_stats['size']),
+        budget=format_size(brepository_default_settings['memory-budget'] * 1024 * 1024),
+        peak=format_size(brepository_cache_stats['peak']),
+        entries=len(brepository_cache),
+        hits=brepository_cache_stats['hits'],
+        misses=brepository_cache_stats['misses'],
+        evictions=brepository_cache_stats['evictions']
+    ))
+
+
+def get_template(source):
+    """
+    Get compiled template
+
+    :param source: template source
+    :return: jinja2 template
+    """
+
+    source = source.strip('\t\r\n').replace('&gt;', '>').replace('&lt;', '<')
+    template = cache_get('template', source)
+    if template is None:
+        template = cache_set('template', source, Template(source), size=approximate_size(source) * TEMPLATE_SIZE_FACTOR)
+
+    return template
+
+
+def render_template(source, **kwargs):
+    """
+    Render template, rendered fragments are memoised
+
+    :param source: template source
+    :return: html content
+    """
+
+    try:
+        key = (source, json.dumps(kwargs, default=str))
+    except (TypeError, ValueError):
+        return BeautifulSoup(get_template(source).render(**kwargs), "html.parser").decode()
+
+    html = cache_get('fragment', key)
+    if html is None:
+        html = BeautifulSoup(get_template(source).render(**kwargs), "html.parser").decode()
+        html = cache_set('fragment', key, html)
+
+    return html
+
 
 def search(name, repository):
     return [element for element in repository if element['name'] == name]
@@ -306,6 +556,11 @@ def load_repository(source):
     """
 
     if source and os.path.isfile(source):
+        mtime = os.path.getmtime(source)
+        cached = cache_get('registry', source)
+        if cached is not None and cached['mtime'] == mtime:
+            return cached['repository']
+
         try:
             from distutils.version import LooseVersion
             if LooseVersion(str(yaml.__version__)) >= "5.1":
@@ -326,6 +581,7 @@ def load_repository(source):
                     set_data[set] = item_list
                 repository['sets'] = set_data
 
+            cache_set('registry', source, {'mtime': mtime, 'repository': repository})
             return repository
 
         except ValueError:
@@ -337,6 +593,480 @@ def load_repository(source):
         return False
 
 
+def format_size(size):
+    """
+    Format byte count into human readable form
+
+    :param size: size in bytes
+    :return: string
+    """
+
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            if unit == 'B':
+                return '{size:d} {unit}'.format(size=int(size), unit=unit)
+            return '{size:.1f} {unit}'.format(size=size, unit=unit)
+        size /= 1024.0
+
+    return '{size:.1f} TB'.format(size=size)
+
+
+def local_path(url, settings):
+    """
+    Resolve item url into a local file under the content or output path
+
+    :param url: item url
+    :param settings: settings dict
+    :return: absolute filename or None
+    """
+
+    if not url:
+        return None
+
+    for tag in ['{static}', '{filename}', '{attach}']:
+        if url.startswith(tag):
+            url = url[len(tag):]
+
+    if settings['site-url'] and url.startswith(settings['site-url']):
+        url = url[len(settings['site-url']):]
+
+    parsed = urlparse(url)
+    if parsed.scheme or parsed.netloc or not parsed.path:
+        return None
+
+    relative_path = unquote(parsed.path).lstrip('/')
+    for base_path in [settings['content-path'], settings['output-path']]:
+        if base_path:
+            filename = os.path.abspath(os.path.join(base_path, relative_path))
+            if in_base_path(filename=filename, settings=settings) and os.path.isfile(filename):
+                return filename
+
+    return None
+
+
+def in_base_path(filename, settings):
+    """
+    Check that file is under the content or output path
+
+    :param filename: absolute filename
+    :param settings: settings dict
+    :return: bool
+    """
+
+    for base_path in [settings['content-path'], settings['output-path']]:
+        if base_path:
+            base_path = os.path.abspath(base_path)
+            if os.path.commonpath([filename, base_path]) == base_path:
+                return True
+
+    return False
+
+
+def hash_file(filename):
+    """
+    Calculate SHA-256 digest for the file, file is read in chunks
+
+    :param filename: filename
+    :return: hex digest
+    """
+
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def update_file_info(repository, settings):
+    """
+    Add size and SHA-256 digest to items pointing to local files. Digests are
+    stored in the file information store and recalculated only when file
+    modification time or size changes.
+
+    :param repository: list of item data dicts
+    :param settings: settings dict
+    :return: nothing
+    """
+
+    if not settings['file-info'] or not repository:
+        return
+
+    items = {}
+    for item_data in repository:
+        filename = local_path(url=item_data.get('url'), settings=settings)
+        if filename:
+            items.setdefault(filename, []).append(item_data)
+
+    if not items:
+        return
+
+    stats = {}
+    to_hash = []
+    for filename in list(items):
+        try:
+            stat = os.stat(filename)
+
+        except OSError:
+            logger.warn('`pelican-brepository` failed to read file [' + str(filename) + ']')
+            del items[filename]
+            continue
+
+        stats[filename] = stat
+        info = brepository_file_info.get(filename)
+        if not info or info['mtime'] != stat.st_mtime or info['size'] != stat.st_size:
+            to_hash.append(filename)
+
+    if to_hash:
+        if settings['debug_processing']:
+            logger.debug(msg='[{plugin_name}] hashing files:[{file_count}]'.format(
+                plugin_name='brepository',
+                file_count=len(to_hash)
+            ))
+
+        with ThreadPoolExecutor(max_workers=settings['file-info-workers']) as executor:
+            futures = dict((filename, executor.submit(hash_file, filename)) for filename in to_hash)
+
+            for filename, future in futures.items():
+                try:
+                    brepository_file_info[filename] = {
+                        'mtime': stats[filename].st_mtime,
+                        'size': stats[filename].st_size,
+                        'sha256': future.result()
+                    }
+
+                except OSError:
+                    logger.warn('`pelican-brepository` failed to read file [' + str(filename) + ']')
+                    brepository_file_info.pop(filename, None)
+                    del items[filename]
+
+    for filename, item_list in items.items():
+        info = brepository_file_info[filename]
+        for item_data in item_list:
+            item_data['size'] = format_size(info['size'])
+            item_data['size-bytes'] = info['size']
+            item_data['sha256'] = info['sha256']
+
+
+async def check_link(session, url):
+    """
+    Check single url, HEAD request is used first and GET if server does not accept it
+
+    :param session: aiohttp client session
+    :param url: url
+    :return: result dict
+    """
+    import aiohttp
+
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            status = response.status
+
+        if status in [403, 405, 501]:
+            async with session.get(url, allow_redirects=True) as response:
+                status = response.status
+
+        return {'status': status, 'error': None}
+
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        return {'status': None, 'error': str(e) or e.__class__.__name__}
+
+
+async def check_links(urls, settings):
+    """
+    Check urls concurrently, concurrency is bounded globally and per host
+
+    :param urls: list of urls
+    :param settings: settings dict
+    :return: dict, url -> result dict
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=settings['link-check-concurrency'],
+        limit_per_host=settings['link-check-per-host']
+    )
+    timeout = aiohttp.ClientTimeout(total=settings['link-check-timeout'])
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(*[check_link(session=session, url=url) for url in urls])
+
+    return dict(zip(urls, results))
+
+
+def link_transient(info):
+    """
+    Check whether link check result can be temporary, connection error, timeout, rate limiting or server error
+
+    :param info: link check result dict
+    :return: bool
+    """
+
+    return info['status'] is None or info['status'] == 429 or info['status'] >= 500
+
+
+def link_state(info):
+    """
+    Link state from link check result. Rate limiting and server errors are
+    considered dead only after failing in consecutive checks.
+
+    :param info: link check result dict
+    :return: 'ok', 'dead' or 'unknown'
+    """
+
+    if info['status'] is None:
+        return 'dead'
+
+    if info['status'] < 400:
+        return 'ok'
+
+    if link_transient(info) and info.get('failures', 1) < 2:
+        return 'unknown'
+
+    return 'dead'
+
+
+def registry_links(source):
+    """
+    Collect http and https urls of the registry items
+
+    :param source: filename of the data file
+    :return: dict, url -> list of item data dicts
+    """
+
+    repository = load_repository(source=source)
+    if not repository or not repository.get('repository'):
+        return {}
+
+    links = OrderedDict()
+    for item_data in repository['repository']:
+        url = item_data.get('url')
+        if url and urlparse(url).scheme in ['http', 'https']:
+            links.setdefault(url, []).append(item_data)
+
+    return links
+
+
+def check_registry_links(sources, settings):
+    """
+    Check urls of all items in the registries. All urls are checked with a single
+    client session. Results are stored in the link check store and urls are
+    checked again only after the store entry is older than the set time-to-live.
+    Connection errors, timeouts, rate limiting and server errors can be
+    temporary, and they use a shorter time-to-live.
+
+    :param sources: list of registry filenames
+    :param settings: settings dict
+    :return: nothing
+    """
+
+    urls = OrderedDict()
+    for source in sources:
+        if source:
+            urls.update(registry_links(source=source))
+
+    now = time.time()
+    to_check = []
+    for url in urls:
+        info = brepository_link_status.get(url)
+        if info and link_transient(info):
+            ttl = settings['link-check-error-ttl']
+        else:
+            ttl = settings['link-check-ttl']
+
+        if not info or now - info['checked'] > ttl:
+            to_check.append(url)
+
+    if not to_check:
+        return
+
+    try:
+        import aiohttp
+    except ImportError:
+        logger.warn('`pelican-brepository` link check requires aiohttp, install it with `pip install aiohttp`')
+        return
+
+    if settings['debug_processing']:
+        logger.debug(msg='[{plugin_name}] checking links:[{link_count}]'.format(
+            plugin_name='brepository',
+            link_count=len(to_check)
+        ))
+
+    results = asyncio.run(check_links(urls=to_check, settings=settings))
+    for url, result in results.items():
+        result['checked'] = now
+        result['failures'] = 0
+        if link_transient(result):
+            previous = brepository_link_status.get(url)
+            if previous and link_transient(previous):
+                result['failures'] = previous.get('failures', 1) + 1
+            else:
+                result['failures'] = 1
+
+        brepository_link_status[url] = result
+
+
+def link_check_start(generator):
+    """
+    Link check stage before content processing, checks the global registry and
+    registries loaded in the previous builds
+
+    """
+
+    global brepository_link_check_started
+
+    if not brepository_default_settings['link-check'] or brepository_link_check_started:
+        return
+
+    brepository_link_check_started = True
+    brepository_link_sources.add(brepository_default_settings['data-source'])
+    for kind, key in list(brepository_cache):
+        if kind == 'registry':
+            brepository_link_sources.add(key)
+
+    check_registry_links(sources=sorted(source for source in brepository_link_sources if source), settings=brepository_default_settings)
+
+
+def link_check_finish(generators):
+    """
+    Link check stage after content processing, checks registries first used in
+    this build. Their link status is shown in the pages from the next build on.
+
+    """
+
+    if not brepository_default_settings['link-check']:
+        return
+
+    check_registry_links(sources=sorted(source for source in brepository_link_sources if source), settings=brepository_default_settings)
+
+
+def update_link_status(repository, settings):
+    """
+    Add link status from the link check store to the items
+
+    :param repository: list of item data dicts
+    :param settings: settings dict
+    :return: nothing
+    """
+
+    if not settings['link-check'] or not repository:
+        return
+
+    brepository_link_sources.add(settings['data-source'])
+    for item_data in repository:
+        url = item_data.get('url')
+        if url and url in brepository_link_status:
+            item_data['link-status'] = link_state(brepository_link_status[url])
+
+
+def dead_links():
+    """
+    Collect dead links of the registries used during the build
+
+    :return: dict, url -> {'status', 'error', 'items'}
+    """
+
+    links = {}
+    for source in sorted(source for source in brepository_link_sources if source):
+        for url, item_list in registry_links(source=source).items():
+            info = brepository_link_status.get(url)
+            if info and link_state(info) == 'dead':
+                dead_link = links.setdefault(url, {'status': info['status'], 'error': info['error'], 'items': []})
+                for item_data in item_list:
+                    if item_data.get('name') not in dead_link['items']:
+                        dead_link['items'].append(item_data.get('name'))
+
+    return links
+
+
+def load_store(filename):
+    """
+    Load persistent store
+
+    :param filename: store filename
+    :return: dict
+    """
+
+    if filename and os.path.isfile(filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as file:
+                return json.load(file)
+
+        except ValueError:
+            logger.warn('`pelican-brepository` failed to load store [' + str(filename) + ']')
+
+    return {}
+
+
+def save_store(filename, data):
+    """
+    Save persistent store
+
+    :param filename: store filename
+    :param data: dict
+    :return: nothing
+    """
+
+    if not filename:
+        return
+
+    if not os.path.exists(os.path.dirname(os.path.abspath(filename))):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)))
+
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(u'' + json.dumps(data, indent=1, sort_keys=True))
+
+
+def report_dead_links():
+    """
+    Report dead links found during the build to log and to report file
+
+    """
+
+    links = dead_links()
+    for url in sorted(links):
+        dead_link = links[url]
+        logger.warn('`pelican-brepository` dead link [' + url + '] status [' + str(dead_link['status'] or dead_link['error']) + '] items [' + ', '.join(str(name) for name in dead_link['items']) + ']')
+
+    filename = brepository_default_settings['link-check-report']
+    if filename:
+        if not os.path.exists(os.path.dirname(os.path.abspath(filename))):
+            os.makedirs(os.path.dirname(os.path.abspath(filename)))
+
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write(u'' + json.dumps(links, indent=1, sort_keys=True))
+
+
+def finalize(pelican):
+    """
+    Save persistent stores, report dead links and memory usage, and reset per-build state
+
+    """
+
+    save_stores(pelican)
+    report_memory(pelican)
+    reset_build_state()
+
+
+def save_stores(pelican):
+    """
+    Save persistent stores and report dead links
+
+    """
+
+    if brepository_default_settings['file-info']:
+        save_store(
+            filename=brepository_default_settings['file-info-cache'],
+            data=dict(
+                (filename, info) for filename, info in brepository_file_info.items()
+                if os.path.isfile(filename) and in_base_path(filename=filename, settings=brepository_default_settings)
+            )
+        )
+
+    if brepository_default_settings['link-check']:
+        save_store(filename=brepository_default_settings['link-check-cache'], data=brepository_link_status)
+        report_dead_links()
+
+
 def get_attribute(attrs, name, default=None):
     """
     Get div attribute
@@ -352,13 +1082,13 @@ def get_attribute(attrs, name, default=None):
         return default
 
 
-def generate_listing_item(item_data, settings):
+def item_context(item_data, settings):
     """
-    Generate repository listing item
+    Collect template variables for repository item
 
     :param item_data: item data dict
     :param settings: settings dict
-    :return: html content
+    :return: dict
     """
 
     if 'type' in item_data and item_data['type'] in settings['type-icons']:
@@ -366,20 +1096,34 @@ def generate_listing_item(item_data, settings):
     else:
         type_icon = None
 
-    template = Template(settings['item-template'][settings['mode']].strip('\t\r\n').replace('&gt;', '>').replace('&lt;', '<'))
-    html = BeautifulSoup(template.render(site_url=settings['site-url'],
-                                         type_icon=type_icon,
-                                         title=item_data['title'] if 'title' in item_data else '',
-                                         url=item_data['url'] if 'url' in item_data else '',
-                                         type=item_data['type'] if 'type' in item_data else '',
-                                         size=item_data['size'] if 'size' in item_data else '',
-                                         DOI=item_data['DOI'] if 'DOI' in item_data else '',
-                                         DOI_img=item_data['DOI_img'] if 'DOI_img' in item_data else '',
-                                         version=item_data['version'] if 'version' in item_data else '',
-                                         password=item_data['password'] if 'password' in item_data else '',
-                                         package_type=item_data['package-type'] if 'package-type' in item_data else '',
-                                         ), "html.parser")
-    return html.decode()
+    return {
+        'site_url': settings['site-url'],
+        'type_icon': type_icon,
+        'title': item_data['title'] if 'title' in item_data else '',
+        'url': item_data['url'] if 'url' in item_data else '',
+        'type': item_data['type'] if 'type' in item_data else '',
+        'size': item_data['size'] if 'size' in item_data else '',
+        'size_bytes': item_data['size-bytes'] if 'size-bytes' in item_data else '',
+        'sha256': item_data['sha256'] if 'sha256' in item_data else '',
+        'link_status': item_data['link-status'] if 'link-status' in item_data else '',
+        'DOI': item_data['DOI'] if 'DOI' in item_data else '',
+        'DOI_img': item_data['DOI_img'] if 'DOI_img' in item_data else '',
+        'version': item_data['version'] if 'version' in item_data else '',
+        'password': item_data['password'] if 'password' in item_data else '',
+        'package_type': item_data['package-type'] if 'package-type' in item_data else '',
+    }
+
+
+def generate_listing_item(item_data, settings):
+    """
+    Generate repository listing item
+
+    :param item_data: item data dict
+    :param settings: settings dict
+    :return: html content
+    """
+
+    return render_template(settings['item-template'][settings['mode']], **item_context(item_data=item_data, settings=settings))
 
 
 def generate_item_card(settings):
@@ -394,30 +1138,16 @@ def generate_item_card(settings):
     item_data = search(name=settings['item'], repository=repository['repository'])
     if item_data:
         item_data = item_data[0]
+        update_file_info(repository=[item_data], settings=settings)
+        update_link_status(repository=[item_data], settings=settings)
+        cache_refresh('registry', settings['data-source'])
     else:
         logger.warn('`pelican-brepository` failed to find item [' + str(settings['item']) + ']')
         return False
 
-    if 'type' in item_data and item_data['type'] in settings['type-icons']:
-        type_icon = settings['type-icons'][item_data['type']]
-    else:
-        type_icon = None
-    template = Template(settings['item-card'].strip('\t\r\n').replace('&gt;', '>').replace('&lt;', '<'))
-
-    html = BeautifulSoup(template.render(site_url=settings['site-url'],
-                                         type_icon= type_icon,
-                                         title=item_data['title'] if 'title' in item_data else '',
-                                         url=item_data['url'] if 'url' in item_data else '',
-                                         type=item_data['type'] if 'type' in item_data else '',
-                                         size=item_data['size'] if 'size' in item_data else '',
-                                         DOI=item_data['DOI'] if 'DOI' in item_data else '',
-                                         DOI_img=item_data['DOI_img'] if 'DOI_img' in item_data else '',
-                                         version=item_data['version'] if 'version' in item_data else '',
-                                         password=item_data['password'] if 'password' in item_data else '',
-                                         package_type=item_data['package-type'] if 'package-type' in item_data else '',
-                                         ), "html.parser")
+    html = render_template(settings['item-card'], **item_context(item_data=item_data, settings=settings))
 
-    return html
+    return BeautifulSoup(html, "html.parser")
 
 
 def generate_listing(settings):
@@ -434,12 +1164,17 @@ def generate_listing(settings):
         repository = repository['repository']
 
     if repository:
+        update_file_info(repository=repository, settings=settings)
+        update_link_status(repository=repository, settings=settings)
+        cache_refresh('registry', settings['data-source'])
+
         html = "\n"
         for item_data in repository:
             html += generate_listing_item(item_data=item_data, settings=settings) + "\n"
         html += "\n"
 
-        template = Template(settings['template'][settings['mode']].strip('\t\r\n').replace('&gt;', '>').replace('&lt;', '<'))
+        # Listing wrapper is not memoised, the rendered items are already cached as fragments
+        template = get_template(settings['template'][settings['mode']])
 
         return BeautifulSoup(template.render(list=html,
                                              header=settings['header'],
@@ -670,8 +1405,20 @@ def init_default_config(pelican):
 
     """
     global brepository_default_settings, brepository_settings
+    global brepository_file_info, brepository_link_status
+
+    clear_caches()
+    brepository_default_settings = copy.deepcopy(brepository_base_settings)
 
     brepository_default_settings['site-url'] = pelican.settings['SITEURL']
+    brepository_default_settings['content-path'] = pelican.settings.get('PATH')
+    brepository_default_settings['output-path'] = pelican.settings.get('OUTPUT_PATH')
+    brepository_default_settings['file-info-cache'] = os.path.join(
+        pelican.settings.get('CACHE_PATH', 'cache'), 'brepository-file-info.json'
+    )
+    brepository_default_settings['link-check-cache'] = os.path.join(
+        pelican.settings.get('CACHE_PATH', 'cache'), 'brepository-link-check.json'
+    )
 
     if 'BREPOSITORY_SOURCE' in pelican.settings:
         brepository_default_settings['data-source'] = pelican.settings['BREPOSITORY_SOURCE']
@@ -703,6 +1450,45 @@ def init_default_config(pelican):
     if 'BREPOSITORY_DEBUG_PROCESSING' in pelican.settings:
         brepository_default_settings['debug_processing'] = pelican.settings['BREPOSITORY_DEBUG_PROCESSING']
 
+    if 'BREPOSITORY_FILE_INFO' in pelican.settings:
+        brepository_default_settings['file-info'] = pelican.settings['BREPOSITORY_FILE_INFO']
+
+    if 'BREPOSITORY_FILE_INFO_CACHE' in pelican.settings:
+        brepository_default_settings['file-info-cache'] = pelican.settings['BREPOSITORY_FILE_INFO_CACHE']
+
+    if 'BREPOSITORY_FILE_INFO_WORKERS' in pelican.settings:
+        brepository_default_settings['file-info-workers'] = pelican.settings['BREPOSITORY_FILE_INFO_WORKERS']
+
+    if 'BREPOSITORY_LINK_CHECK_ERROR_TTL' in pelican.settings:
+        brepository_default_settings['link-check-error-ttl'] = pelican.settings['BREPOSITORY_LINK_CHECK_ERROR_TTL']
+
+    if 'BREPOSITORY_MEMORY_BUDGET' in pelican.settings:
+        brepository_default_settings['memory-budget'] = pelican.settings['BREPOSITORY_MEMORY_BUDGET']
+
+    if 'BREPOSITORY_LINK_CHECK' in pelican.settings:
+        brepository_default_settings['link-check'] = pelican.settings['BREPOSITORY_LINK_CHECK']
+
+    if 'BREPOSITORY_LINK_CHECK_CACHE' in pelican.settings:
+        brepository_default_settings['link-check-cache'] = pelican.settings['BREPOSITORY_LINK_CHECK_CACHE']
+
+    if 'BREPOSITORY_LINK_CHECK_REPORT' in pelican.settings:
+        brepository_default_settings['link-check-report'] = pelican.settings['BREPOSITORY_LINK_CHECK_REPORT']
+
+    if 'BREPOSITORY_LINK_CHECK_CONCURRENCY' in pelican.settings:
+        brepository_default_settings['link-check-concurrency'] = pelican.settings['BREPOSITORY_LINK_CHECK_CONCURRENCY']
+
+    if 'BREPOSITORY_LINK_CHECK_PER_HOST' in pelican.settings:
+        brepository_default_settings['link-check-per-host'] = pelican.settings['BREPOSITORY_LINK_CHECK_PER_HOST']
+
+    if 'BREPOSITORY_LINK_CHECK_TIMEOUT' in pelican.settings:
+        brepository_default_settings['link-check-timeout'] = pelican.settings['BREPOSITORY_LINK_CHECK_TIMEOUT']
+
+    if 'BREPOSITORY_LINK_CHECK_TTL' in pelican.settings:
+        brepository_default_settings['link-check-ttl'] = pelican.settings['BREPOSITORY_LINK_CHECK_TTL']
+
+    brepository_file_info = load_store(filename=brepository_default_settings['file-info-cache'])
+    brepository_link_status = load_store(filename=brepository_default_settings['link-check-cache'])
+
     brepository_settings = copy.deepcopy(brepository_default_settings)
 
 
@@ -718,3 +1504,6 @@ def register():
     signals.article_generator_finalized.connect(move_resources)
 
     signals.content_object_init.connect(brepository)
+    signals.generator_init.connect(link_check_start)
+    signals.all_generators_finalized.connect(link_check_finish)
+    signals.finalized.connect(finalize)
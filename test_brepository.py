@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for file information, link check against a local HTTP server, and in-process caches
+
+"""
+
+import copy
+import hashlib
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import yaml
+
+from .brepository import register
+
+# Package namespace exports the brepository() content handler under the module name
+brepository = sys.modules[register.__module__]
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_HEAD(self):
+        self.requests.append(('HEAD', self.path))
+        if self.path == '/ok':
+            self.send_response(200)
+        elif self.path == '/no-head':
+            self.send_response(405)
+        elif self.path == '/unavailable':
+            self.send_response(503)
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+    def do_GET(self):
+        self.requests.append(('GET', self.path))
+        if self.path in ['/ok', '/no-head']:
+            self.send_response(200)
+        elif self.path == '/unavailable':
+            self.send_response(503)
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    pytest.importorskip('aiohttp')
+    Handler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{port}'.format(port=httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def refused_url():
+    pytest.importorskip('aiohttp')
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return 'http://127.0.0.1:{port}/file.zip'.format(port=port)
+
+
+@pytest.fixture
+def settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(brepository, 'brepository_link_status', {})
+    monkeypatch.setattr(brepository, 'brepository_link_sources', set())
+    monkeypatch.setattr(brepository, 'brepository_link_check_started', False)
+    monkeypatch.setattr(brepository, 'brepository_cache', OrderedDict())
+    monkeypatch.setattr(brepository, 'brepository_cache_stats', {'size': 0, 'peak': 0, 'hits': 0, 'misses': 0, 'evictions': 0})
+
+    settings = copy.deepcopy(brepository.brepository_base_settings)
+    settings['link-check'] = True
+    settings['link-check-timeout'] = 5
+    settings['link-check-cache'] = str(tmp_path / 'link-check.json')
+    settings['link-check-report'] = str(tmp_path / 'report.json')
+    settings['file-info'] = False
+    monkeypatch.setattr(brepository, 'brepository_default_settings', settings)
+    return settings
+
+
+@pytest.fixture
+def check_calls(monkeypatch):
+    calls = []
+    check_links = brepository.check_links
+
+    def counting_check_links(urls, settings):
+        calls.append(urls)
+        return check_links(urls=urls, settings=settings)
+
+    monkeypatch.setattr(brepository, 'check_links', counting_check_links)
+    return calls
+
+
+def write_registry(filename, items):
+    with open(str(filename), 'w') as file:
+        yaml.dump({'repository': items}, file)
+
+    return str(filename)
+
+
+def check(settings, tmp_path, items):
+    """
+    Run link check stage for the global registry and add link status to its items
+    """
+
+    settings['data-source'] = write_registry(tmp_path / 'repository.yaml', items)
+    brepository.link_check_start(generator=None)
+
+    repository = brepository.load_repository(source=settings['data-source'])['repository']
+    brepository.update_link_status(repository=repository, settings=settings)
+    return repository
+
+
+def test_link_ok(server, settings, tmp_path):
+    items = check(settings, tmp_path, [{'name': 'ok', 'url': server + '/ok'}])
+
+    assert items[0]['link-status'] == 'ok'
+    assert not brepository.dead_links()
+
+
+def test_link_not_found(server, settings, tmp_path):
+    items = check(settings, tmp_path, [{'name': 'missing', 'url': server + '/missing'}])
+
+    assert items[0]['link-status'] == 'dead'
+    assert brepository.brepository_link_status[server + '/missing']['status'] == 404
+
+
+def test_link_connection_refused(refused_url, settings, tmp_path):
+    items = check(settings, tmp_path, [{'name': 'refused', 'url': refused_url}])
+
+    assert items[0]['link-status'] == 'dead'
+    assert brepository.brepository_link_status[refused_url]['status'] is None
+    assert brepository.brepository_link_status[refused_url]['error']
+
+
+def test_link_head_not_allowed(server, settings, tmp_path):
+    items = check(settings, tmp_path, [{'name': 'no-head', 'url': server + '/no-head'}])
+
+    assert items[0]['link-status'] == 'ok'
+    assert Handler.requests == [('HEAD', '/no-head'), ('GET', '/no-head')]
+
+
+def test_link_store_ttl(server, settings, tmp_path):
+    brepository.brepository_link_status[server + '/ok'] = {'checked': time.time(), 'status': 404, 'error': None}
+
+    items = check(settings, tmp_path, [{'name': 'ok', 'url': server + '/ok'}])
+
+    assert items[0]['link-status'] == 'dead'
+    assert Handler.requests == []
+
+
+def test_link_store_expired(server, settings, tmp_path):
+    brepository.brepository_link_status[server + '/ok'] = {
+        'checked': time.time() - settings['link-check-ttl'] - 1,
+        'status': 404,
+        'error': None
+    }
+
+    items = check(settings, tmp_path, [{'name': 'ok', 'url': server + '/ok'}])
+
+    assert items[0]['link-status'] == 'ok'
+    assert Handler.requests == [('HEAD', '/ok')]
+
+
+def test_link_store_error_ttl(server, settings, tmp_path):
+    brepository.brepository_link_status[server + '/ok'] = {
+        'checked': time.time() - settings['link-check-error-ttl'] - 1,
+        'status': None,
+        'error': 'Connection refused'
+    }
+
+    items = check(settings, tmp_path, [{'name': 'ok', 'url': server + '/ok'}])
+
+    assert items[0]['link-status'] == 'ok'
+    assert Handler.requests == [('HEAD', '/ok')]
+
+
+def test_link_unavailable(server, settings, tmp_path):
+    url = server + '/unavailable'
+    items = check(settings, tmp_path, [{'name': 'unavailable', 'url': url}])
+
+    assert items[0]['link-status'] == 'unknown'
+    assert brepository.brepository_link_status[url]['failures'] == 1
+    assert not brepository.dead_links()
+
+    # Server errors use the shorter time-to-live
+    brepository.brepository_link_status[url]['checked'] -= settings['link-check-error-ttl'] + 1
+    brepository.link_check_finish(generators=[])
+    brepository.update_link_status(repository=items, settings=settings)
+
+    assert items[0]['link-status'] == 'dead'
+    assert brepository.brepository_link_status[url]['failures'] == 2
+    assert brepository.dead_links()[url]['status'] == 503
+    assert Handler.requests == [('HEAD', '/unavailable'), ('HEAD', '/unavailable')]
+
+
+def test_link_check_stage(server, settings, tmp_path, check_calls):
+    settings['data-source'] = write_registry(tmp_path / 'repository.yaml', [
+        {'name': 'ok', 'url': server + '/ok'},
+        {'name': 'missing', 'url': server + '/missing'},
+        {'name': 'local', 'url': 'files/local.zip'},
+    ])
+    page_source = write_registry(tmp_path / 'page.yaml', [
+        {'name': 'page', 'url': server + '/no-head'},
+    ])
+
+    # All items of the global registry are checked once, in a single session, before content processing
+    brepository.link_check_start(generator=None)
+    brepository.link_check_start(generator=None)
+
+    assert check_calls == [[server + '/ok', server + '/missing']]
+
+    # Pages only read the store
+    page_settings = dict(settings, **{'data-source': page_source})
+    page_items = brepository.load_repository(source=page_source)['repository']
+    brepository.update_link_status(repository=page_items, settings=page_settings)
+
+    assert 'link-status' not in page_items[0]
+    assert len(check_calls) == 1
+
+    # Registries first used by the pages are checked after content processing
+    brepository.link_check_finish(generators=[])
+
+    assert check_calls[1] == [server + '/no-head']
+    assert brepository.brepository_link_status[server + '/no-head']['status'] == 200
+
+
+def test_link_report(server, refused_url, settings, tmp_path):
+    check(settings, tmp_path, [
+        {'name': 'ok', 'url': server + '/ok'},
+        {'name': 'missing', 'url': server + '/missing'},
+        {'name': 'refused', 'url': refused_url},
+    ])
+    brepository.save_stores(pelican=None)
+
+    with open(settings['link-check-report']) as file:
+        report = json.load(file)
+
+    assert sorted(report) == sorted([server + '/missing', refused_url])
+    assert report[server + '/missing']['items'] == ['missing']
+    assert report[server + '/missing']['status'] == 404
+    assert report[refused_url]['items'] == ['refused']
+
+    with open(settings['link-check-cache']) as file:
+        assert len(json.load(file)) == 3
+
+
+def test_render_unhashable_value(settings):
+    item = {'name': 'file', 'title': 'File', 'url': 'file.zip', 'version': [1, 2]}
+
+    html = brepository.generate_listing_item(item_data=item, settings=settings)
+
+    assert '[1, 2]' in html
+    assert brepository.generate_listing_item(item_data=item, settings=settings) == html
+
+    item['version'] = {1: 'a', 'latest': 'b'}
+    html = brepository.generate_listing_item(item_data=item, settings=settings)
+
+    assert 'latest' in html
+    assert brepository.generate_listing_item(item_data=item, settings=settings) == html
+
+    item['version'] = {(1, 2): 'a'}
+    assert brepository.generate_listing_item(item_data=item, settings=settings)
+
+
+def test_finalize_keeps_cache(server, settings, tmp_path):
+    check(settings, tmp_path, [{'name': 'missing', 'url': server + '/missing'}])
+    brepository.render_template('{{ title }}', title='File')
+    brepository.render_template('{{ title }}', title='File')
+
+    brepository.finalize(pelican=None)
+
+    assert not brepository.brepository_link_sources
+    assert not brepository.brepository_link_check_started
+    assert brepository.brepository_cache_stats['hits'] == 0
+    assert brepository.brepository_cache_stats['misses'] == 0
+    assert brepository.brepository_cache_stats['peak'] == brepository.brepository_cache_stats['size']
+    assert ('registry', settings['data-source']) in brepository.brepository_cache
+
+    brepository.clear_caches()
+
+    assert not brepository.brepository_cache
+    assert brepository.brepository_cache_stats['size'] == 0
+
+
+def test_registry_changed(settings, tmp_path):
+    source = write_registry(tmp_path / 'repository.yaml', [{'name': 'file', 'title': 'Old', 'url': 'file.zip'}])
+    assert brepository.load_repository(source=source)['repository'][0]['title'] == 'Old'
+
+    brepository.finalize(pelican=None)
+
+    write_registry(source, [{'name': 'file', 'title': 'New', 'url': 'file.zip'}])
+    os.utime(source, (time.time() + 10, time.time() + 10))
+
+    assert brepository.load_repository(source=source)['repository'][0]['title'] == 'New'
+
+
+def test_registry_size_after_update(settings, tmp_path):
+    (tmp_path / 'content').mkdir()
+    (tmp_path / 'content' / 'file.zip').write_bytes(b'data')
+    settings['file-info'] = True
+    settings['content-path'] = str(tmp_path / 'content')
+    settings['file-info-cache'] = str(tmp_path / 'file-info.json')
+    settings['data-source'] = write_registry(tmp_path / 'repository.yaml', [{'name': 'file', 'title': 'File', 'url': 'file.zip'}])
+    settings['set'] = None
+
+    brepository.generate_listing(settings=settings)
+
+    key = ('registry', settings['data-source'])
+    entry = brepository.brepository_cache[key]
+    assert entry['value']['repository']['repository'][0]['sha256']
+    assert entry['size'] == brepository.approximate_size(entry['value']) + brepository.approximate_size(settings['data-source'])
+    assert sum(entry['size'] for entry in brepository.brepository_cache.values()) == brepository.brepository_cache_stats['size']
+    assert not [key for key in brepository.brepository_cache if key[0] == 'fragment' and '"list"' in key[1][1]]
+
+
+@pytest.fixture
+def file_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(brepository, 'brepository_file_info', {})
+
+    (tmp_path / 'content' / 'files').mkdir(parents=True)
+    (tmp_path / 'output').mkdir()
+    (tmp_path / 'content' / 'files' / 'data set.zip').write_bytes(b'data' * 1000)
+    (tmp_path / 'outside.txt').write_text(u'outside')
+
+    settings = copy.deepcopy(brepository.brepository_base_settings)
+    settings['site-url'] = 'https://example.org'
+    settings['content-path'] = str(tmp_path / 'content')
+    settings['output-path'] = str(tmp_path / 'output')
+    settings['file-info-cache'] = str(tmp_path / 'cache' / 'file-info.json')
+    monkeypatch.setattr(brepository, 'brepository_default_settings', settings)
+    return settings
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    hash_file = brepository.hash_file
+
+    def counting_hash_file(filename):
+        calls.append(filename)
+        return hash_file(filename)
+
+    monkeypatch.setattr(brepository, 'hash_file', counting_hash_file)
+    return calls
+
+
+def test_local_path(file_settings, tmp_path):
+    filename = str(tmp_path / 'content' / 'files' / 'data set.zip')
+
+    assert brepository.local_path('files/data%20set.zip', file_settings) == filename
+    assert brepository.local_path('/files/data%20set.zip', file_settings) == filename
+    assert brepository.local_path('{static}/files/data%20set.zip', file_settings) == filename
+    assert brepository.local_path('https://example.org/files/data%20set.zip', file_settings) == filename
+
+
+def test_local_path_outside(file_settings):
+    assert brepository.local_path('../outside.txt', file_settings) is None
+    assert brepository.local_path('files/../../outside.txt', file_settings) is None
+    assert brepository.local_path('%2E%2E/outside.txt', file_settings) is None
+    assert brepository.local_path('files/missing.zip', file_settings) is None
+    assert brepository.local_path('https://other.org/files/data%20set.zip', file_settings) is None
+
+
+def test_file_info(file_settings, hash_calls):
+    items = [{'name': 'data', 'url': 'files/data%20set.zip', 'size': '1.0 GB'}]
+    brepository.update_file_info(repository=items, settings=file_settings)
+
+    assert items[0]['size'] == '3.9 KB'
+    assert items[0]['size-bytes'] == 4000
+    assert items[0]['sha256'] == hashlib.sha256(b'data' * 1000).hexdigest()
+    assert len(hash_calls) == 1
+
+
+def test_file_info_hashed_once(file_settings, hash_calls, tmp_path):
+    items = [{'name': 'data', 'url': 'files/data%20set.zip'}]
+    brepository.update_file_info(repository=items, settings=file_settings)
+    brepository.update_file_info(repository=items, settings=file_settings)
+
+    assert len(hash_calls) == 1
+
+    filename = str(tmp_path / 'content' / 'files' / 'data set.zip')
+    stat = os.stat(filename)
+    os.utime(filename, (stat.st_atime, stat.st_mtime + 10))
+    brepository.update_file_info(repository=items, settings=file_settings)
+
+    assert len(hash_calls) == 2
+
+
+def test_file_info_store(file_settings, hash_calls, tmp_path):
+    (tmp_path / 'content' / 'files' / 'removed.zip').write_bytes(b'removed')
+    items = [
+        {'name': 'data', 'url': 'files/data%20set.zip'},
+        {'name': 'removed', 'url': 'files/removed.zip'},
+    ]
+    brepository.update_file_info(repository=items, settings=file_settings)
+    brepository.brepository_file_info[str(tmp_path / 'outside.txt')] = {'mtime': 0, 'size': 0, 'sha256': ''}
+    (tmp_path / 'content' / 'files' / 'removed.zip').unlink()
+    brepository.save_stores(pelican=None)
+
+    store = brepository.load_store(file_settings['file-info-cache'])
+    assert list(store) == [str(tmp_path / 'content' / 'files' / 'data set.zip')]
+
+    brepository.brepository_file_info = store
+    brepository.update_file_info(repository=items[:1], settings=file_settings)
+
+    assert len(hash_calls) == 2
+
+
+def test_file_info_store_keeps_unreferred(file_settings, hash_calls):
+    items = [{'name': 'data', 'url': 'files/data%20set.zip'}]
+    brepository.update_file_info(repository=items, settings=file_settings)
+    brepository.save_stores(pelican=None)
+
+    # Next build does not process the page referring the file
+    brepository.brepository_file_info = brepository.load_store(file_settings['file-info-cache'])
+    brepository.save_stores(pelican=None)
+
+    assert len(brepository.load_store(file_settings['file-info-cache'])) == 1